@@ -15,7 +15,7 @@ from ..services.graph_builder import GraphBuilderService
 from ..services.text_processor import TextProcessor
 from ..utils.file_parser import FileParser
 from ..utils.logger import get_logger
-from ..models.task import TaskManager, TaskStatus
+from ..models.task import get_task_manager, TaskStatus
 from ..models.project import ProjectManager, ProjectStatus
 
 # 获取日志器
@@ -361,7 +361,7 @@ def build_graph():
             }), 400
         
         # 创建异步任务
-        task_manager = TaskManager()
+        task_manager = get_task_manager()
         task_id = task_manager.create_task(f"构建图谱: {graph_name}")
         logger.info(f"创建图谱构建任务: task_id={task_id}, project_id={project_id}")
         
@@ -531,7 +531,7 @@ def get_task(task_id: str):
     """
     查询任务状态
     """
-    task = TaskManager().get_task(task_id)
+    task = get_task_manager().get_task(task_id)
     
     if not task:
         return jsonify({
@@ -549,13 +549,35 @@ def get_task(task_id: str):
 def list_tasks():
     """
     列出所有任务
+    
+    Query参数：
+        task_type: 按任务类型过滤（可选）
+        limit: 返回数量（可选，默认全部）
+        offset: 偏移量（默认0）
+    
+    返回：
+        data 为当前页任务，count 为当前页数量，total 为过滤后的任务总数
     """
-    tasks = TaskManager().list_tasks()
+    limit = request.args.get('limit', type=int)
+    offset = request.args.get('offset', 0, type=int)
+    
+    if (limit is not None and limit < 0) or offset < 0:
+        return jsonify({
+            "success": False,
+            "error": "limit 和 offset 不能为负数"
+        }), 400
+    
+    tasks, total = get_task_manager().list_tasks(
+        task_type=request.args.get('task_type'),
+        limit=limit,
+        offset=offset
+    )
     
     return jsonify({
         "success": True,
-        "data": [t.to_dict() for t in tasks],
-        "count": len(tasks)
+        "data": tasks,
+        "count": len(tasks),
+        "total": total
     })
 
 
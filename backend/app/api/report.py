@@ -13,7 +13,7 @@ from ..config import Config
 from ..services.report_agent import ReportAgent, ReportManager, ReportStatus
 from ..services.simulation_manager import SimulationManager
 from ..models.project import ProjectManager
-from ..models.task import TaskManager, TaskStatus
+from ..models.task import get_task_manager, TaskStatus
 from ..utils.logger import get_logger
 
 logger = get_logger('mirofish.api.report')
@@ -110,7 +110,7 @@ def generate_report():
         report_id = f"report_{uuid.uuid4().hex[:12]}"
         
         # 创建异步任务
-        task_manager = TaskManager()
+        task_manager = get_task_manager()
         task_id = task_manager.create_task(
             task_type="report_generate",
             metadata={
@@ -245,7 +245,7 @@ def get_generate_status():
                 "error": "请提供 task_id 或 simulation_id"
             }), 400
         
-        task_manager = TaskManager()
+        task_manager = get_task_manager()
         task = task_manager.get_task(task_id)
         
         if not task:
@@ -398,7 +398,7 @@ def prepare_simulation():
     """
     import threading
     import os
-    from ..models.task import TaskManager, TaskStatus
+    from ..models.task import get_task_manager, TaskStatus
     from ..config import Config
     
     try:
@@ -487,7 +487,7 @@ def prepare_simulation():
             # 失败不影响后续流程，后台任务会重新获取
         
         # 创建异步任务
-        task_manager = TaskManager()
+        task_manager = get_task_manager()
         task_id = task_manager.create_task(
             task_type="simulation_prepare",
             metadata={
@@ -662,7 +662,7 @@ def get_prepare_status():
             }
         }
     """
-    from ..models.task import TaskManager
+    from ..models.task import get_task_manager
     
     try:
         data = request.get_json() or {}
@@ -705,7 +705,7 @@ def get_prepare_status():
                 "error": "请提供 task_id 或 simulation_id"
             }), 400
         
-        task_manager = TaskManager()
+        task_manager = get_task_manager()
         task = task_manager.get_task(task_id)
         
         if not task:
@@ -31,6 +31,9 @@ class Config:
     LLM_API_KEY = os.environ.get('LLM_API_KEY')
     LLM_BASE_URL = os.environ.get('LLM_BASE_URL', 'https://api.openai.com/v1')
     LLM_MODEL_NAME = os.environ.get('LLM_MODEL_NAME', 'gpt-4o-mini')
+    # 单次请求超时（秒，未设置时使用 OpenAI SDK 默认的 600 秒）与超时/连接错误后的重试次数
+    LLM_TIMEOUT = float(os.environ['LLM_TIMEOUT']) if os.environ.get('LLM_TIMEOUT') else None
+    LLM_MAX_RETRIES = int(os.environ.get('LLM_MAX_RETRIES', '2'))
     
     # Zep配置
     ZEP_API_KEY = os.environ.get('ZEP_API_KEY')
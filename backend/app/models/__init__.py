@@ -2,8 +2,8 @@
 数据模型模块
 """
 
-from .task import TaskManager, TaskStatus
+from .task import TaskManager, TaskStatus, get_task_manager
 from .project import Project, ProjectStatus, ProjectManager
 
-__all__ = ['TaskManager', 'TaskStatus', 'Project', 'ProjectStatus', 'ProjectManager']
+__all__ = ['TaskManager', 'TaskStatus', 'get_task_manager', 'Project', 'ProjectStatus', 'ProjectManager']
 
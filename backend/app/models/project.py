@@ -208,10 +208,14 @@ class ProjectManager:
         cls._ensure_projects_dir()
         
         projects = []
-        for project_id in os.listdir(cls.PROJECTS_DIR):
-            project = cls.get_project(project_id)
-            if project:
-                projects.append(project)
+        with os.scandir(cls.PROJECTS_DIR) as entries:
+            for entry in entries:
+                # scandir 的 is_dir 直接使用目录项类型，无需额外 stat
+                if not entry.is_dir():
+                    continue
+                project = cls.get_project(entry.name)
+                if project:
+                    projects.append(project)
         
         # 按创建时间倒序排序
         projects.sort(key=lambda p: p.created_at, reverse=True)
@@ -3,11 +3,14 @@
 用于跟踪长时间运行的任务（如图谱构建）
 """
 
+import heapq
+import time
 import uuid
 import threading
 from datetime import datetime
 from enum import Enum
-from typing import Dict, Any, Optional
+from operator import attrgetter
+from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 
 
@@ -19,14 +22,14 @@ class TaskStatus(str, Enum):
     FAILED = "failed"            # 失败
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """任务数据类"""
     task_id: str
     task_type: str
     status: TaskStatus
-    created_at: datetime
-    updated_at: datetime
+    created_at: float              # 创建时间（Unix 时间戳）
+    updated_at: float              # 更新时间（Unix 时间戳）
     progress: int = 0              # 总进度百分比 0-100
     message: str = ""              # 状态消息
     result: Optional[Dict] = None  # 任务结果
@@ -40,8 +43,8 @@ class Task:
             "task_id": self.task_id,
             "task_type": self.task_type,
             "status": self.status.value,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "created_at": datetime.fromtimestamp(self.created_at).isoformat(),
+            "updated_at": datetime.fromtimestamp(self.updated_at).isoformat(),
             "progress": self.progress,
             "message": self.message,
             "progress_detail": self.progress_detail,
@@ -55,20 +58,13 @@ class TaskManager:
     """
     任务管理器
     线程安全的任务状态管理
-    """
     
-    _instance = None
-    _lock = threading.Lock()
+    请通过 get_task_manager() 获取全局实例；直接调用 TaskManager() 会创建一个独立的空任务存储
+    """
     
-    def __new__(cls):
-        """单例模式"""
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-                    cls._instance._tasks: Dict[str, Task] = {}
-                    cls._instance._task_lock = threading.Lock()
-        return cls._instance
+    def __init__(self):
+        self._tasks: Dict[str, Task] = {}
+        self._task_lock = threading.Lock()
     
     def create_task(self, task_type: str, metadata: Optional[Dict] = None) -> str:
         """
@@ -82,7 +78,7 @@ class TaskManager:
             任务ID
         """
         task_id = str(uuid.uuid4())
-        now = datetime.now()
+        now = time.time()
         
         task = Task(
             task_id=task_id,
@@ -128,7 +124,7 @@ class TaskManager:
         with self._task_lock:
             task = self._tasks.get(task_id)
             if task:
-                task.updated_at = datetime.now()
+                task.updated_at = time.time()
                 if status is not None:
                     task.status = status
                 if progress is not None:
@@ -161,18 +157,42 @@ class TaskManager:
             error=error
         )
     
-    def list_tasks(self, task_type: Optional[str] = None) -> list:
-        """列出任务"""
+    def list_tasks(
+        self,
+        task_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> Tuple[list, int]:
+        """
+        列出任务（按创建时间倒序）
+        
+        Args:
+            task_type: 按任务类型过滤
+            limit: 返回数量限制（None 表示全部，负数按0处理）
+            offset: 偏移量（负数按0处理）
+            
+        Returns:
+            (任务字典列表, 过滤后的任务总数)，只对返回的这一页调用 to_dict
+        """
+        offset = max(offset, 0)
+        if limit is not None:
+            limit = max(limit, 0)
+        
         with self._task_lock:
-            tasks = list(self._tasks.values())
-            if task_type:
-                tasks = [t for t in tasks if t.task_type == task_type]
-            return [t.to_dict() for t in sorted(tasks, key=lambda x: x.created_at, reverse=True)]
+            tasks = [
+                t for t in self._tasks.values()
+                if not task_type or t.task_type == task_type
+            ]
+            if limit is None:
+                selected = sorted(tasks, key=attrgetter('created_at'), reverse=True)[offset:]
+            else:
+                # 只需要前 offset+limit 个时用堆选取，避免全量排序
+                selected = heapq.nlargest(offset + limit, tasks, key=attrgetter('created_at'))[offset:]
+            return [t.to_dict() for t in selected], len(tasks)
     
     def cleanup_old_tasks(self, max_age_hours: int = 24):
         """清理旧任务"""
-        from datetime import timedelta
-        cutoff = datetime.now() - timedelta(hours=max_age_hours)
+        cutoff = time.time() - max_age_hours * 3600
         
         with self._task_lock:
             old_ids = [
@@ -182,3 +202,17 @@ class TaskManager:
             for tid in old_ids:
                 del self._tasks[tid]
 
+
+# 全局任务管理器（进程内单例）
+_task_manager: Optional[TaskManager] = None
+_task_manager_lock = threading.Lock()
+
+
+def get_task_manager() -> TaskManager:
+    """获取全局任务管理器（首次调用时创建）"""
+    global _task_manager
+    if _task_manager is None:
+        with _task_manager_lock:
+            if _task_manager is None:
+                _task_manager = TaskManager()
+    return _task_manager
@@ -4,7 +4,6 @@
 """
 
 import os
-import uuid
 import time
 import threading
 from typing import Dict, Any, List, Optional, Callable
@@ -14,7 +13,7 @@ from zep_cloud.client import Zep
 from zep_cloud import EpisodeData, EntityEdgeSourceTarget
 
 from ..config import Config
-from ..models.task import TaskManager, TaskStatus
+from ..models.task import get_task_manager, TaskStatus
 from .text_processor import TextProcessor
 
 
@@ -47,7 +46,7 @@ class GraphBuilderService:
             raise ValueError("ZEP_API_KEY 未配置")
         
         self.client = Zep(api_key=self.api_key)
-        self.task_manager = TaskManager()
+        self.task_manager = get_task_manager()
     
     def build_graph_async(
         self,
@@ -185,7 +184,7 @@ class GraphBuilderService:
     
     def create_graph(self, name: str) -> str:
         """创建Zep图谱（公开方法）"""
-        graph_id = f"mirofish_{uuid.uuid4().hex[:16]}"
+        graph_id = f"mirofish_{os.urandom(8).hex()}"
         
         self.client.graph.create(
             graph_id=graph_id,
@@ -429,13 +428,12 @@ class GraphBuilderService:
         nodes = self.client.graph.node.get_by_graph_id(graph_id=graph_id)
         edges = self.client.graph.edge.get_by_graph_id(graph_id=graph_id)
         
-        # 创建节点映射用于获取节点名称
+        # 节点名称映射与节点数据在同一次遍历中构建
         node_map = {}
-        for node in nodes:
-            node_map[node.uuid_] = node.name or ""
-        
         nodes_data = []
         for node in nodes:
+            node_map[node.uuid_] = node.name or ""
+            
             # 获取创建时间
             created_at = getattr(node, 'created_at', None)
             if created_at:
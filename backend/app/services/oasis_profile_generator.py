@@ -8,6 +8,7 @@ OASIS Agent Profile生成器
 3. 区分个人实体和抽象群体实体
 """
 
+import re
 import json
 import random
 import time
@@ -15,11 +16,11 @@ from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
 
-from openai import OpenAI
 from zep_cloud.client import Zep
 
 from ..config import Config
 from ..utils.logger import get_logger
+from ..utils.llm_client import get_openai_client
 from .zep_entity_reader import EntityNode, ZepEntityReader
 
 logger = get_logger('mirofish.oasis_profile')
@@ -165,17 +166,17 @@ class OasisProfileGenerator:
         "Canada", "Australia", "Brazil", "India", "South Korea"
     ]
     
-    # 个人类型实体（需要生成具体人设）
-    INDIVIDUAL_ENTITY_TYPES = [
+    # 个人类型实体（需要生成具体人设），frozenset 以 O(1) 判断成员
+    INDIVIDUAL_ENTITY_TYPES = frozenset({
         "student", "alumni", "professor", "person", "publicfigure", 
         "expert", "faculty", "official", "journalist", "activist"
-    ]
+    })
     
     # 群体/机构类型实体（需要生成群体代表人设）
-    GROUP_ENTITY_TYPES = [
+    GROUP_ENTITY_TYPES = frozenset({
         "university", "governmentagency", "organization", "ngo", 
         "mediaoutlet", "company", "institution", "group", "community"
-    ]
+    })
     
     def __init__(
         self, 
@@ -192,10 +193,7 @@ class OasisProfileGenerator:
         if not self.api_key:
             raise ValueError("LLM_API_KEY 未配置")
         
-        self.client = OpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url
-        )
+        self.client = get_openai_client(self.api_key, self.base_url)
         
         # Zep客户端用于检索丰富上下文
         self.zep_api_key = zep_api_key or Config.ZEP_API_KEY
@@ -581,8 +579,6 @@ class OasisProfileGenerator:
     
     def _fix_truncated_json(self, content: str) -> str:
         """修复被截断的JSON（输出被max_tokens限制截断）"""
-        import re
-        
         # 如果JSON被截断，尝试闭合它
         content = content.strip()
         
@@ -604,8 +600,6 @@ class OasisProfileGenerator:
     
     def _try_fix_json(self, content: str, entity_name: str, entity_type: str, entity_summary: str = "") -> Dict[str, Any]:
         """尝试修复损坏的JSON"""
-        import re
-        
         # 1. 首先尝试修复被截断的情况
         content = self._fix_truncated_json(content)
         
@@ -31,6 +31,15 @@ from .zep_tools import (
 
 logger = get_logger('mirofish.report_agent')
 
+# 预编译的正则：按行匹配Markdown标题、清理响应中的工具调用标记
+_MARKDOWN_HEADING_RE = re.compile(r'^(#{1,6})\s+(.+)$')
+_TOOL_CALL_TAG_RE = re.compile(r'<tool_call>.*?</tool_call>', re.DOTALL)
+_TOOL_CALL_BRACKET_RE = re.compile(r'\[TOOL_CALL\].*?\)')
+# 解析工具调用：XML风格、函数调用风格及其参数
+_TOOL_CALL_XML_RE = re.compile(r'<tool_call>\s*(\{.*?\})\s*</tool_call>', re.DOTALL)
+_TOOL_CALL_FUNC_RE = re.compile(r'\[TOOL_CALL\]\s*(\w+)\s*\((.*?)\)', re.DOTALL)
+_TOOL_CALL_PARAM_RE = re.compile(r'(\w+)\s*=\s*["\']([^"\']*)["\']')
+
 
 class ReportLogger:
     """
@@ -769,8 +778,7 @@ class ReportAgent:
         tool_calls = []
         
         # 格式1: XML风格
-        xml_pattern = r'<tool_call>\s*(\{.*?\})\s*</tool_call>'
-        for match in re.finditer(xml_pattern, response, re.DOTALL):
+        for match in _TOOL_CALL_XML_RE.finditer(response):
             try:
                 call_data = json.loads(match.group(1))
                 tool_calls.append(call_data)
@@ -778,14 +786,13 @@ class ReportAgent:
                 pass
         
         # 格式2: 函数调用风格
-        func_pattern = r'\[TOOL_CALL\]\s*(\w+)\s*\((.*?)\)'
-        for match in re.finditer(func_pattern, response, re.DOTALL):
+        for match in _TOOL_CALL_FUNC_RE.finditer(response):
             tool_name = match.group(1)
             params_str = match.group(2)
             
             # 解析参数
             params = {}
-            for param_match in re.finditer(r'(\w+)\s*=\s*["\']([^"\']*)["\']', params_str):
+            for param_match in _TOOL_CALL_PARAM_RE.finditer(params_str):
                 params[param_match.group(1)] = param_match.group(2)
             
             tool_calls.append({
@@ -1739,8 +1746,8 @@ class ReportAgent:
             
             if not tool_calls:
                 # 没有工具调用，直接返回响应
-                clean_response = re.sub(r'<tool_call>.*?</tool_call>', '', response, flags=re.DOTALL)
-                clean_response = re.sub(r'\[TOOL_CALL\].*?\)', '', clean_response)
+                clean_response = _TOOL_CALL_TAG_RE.sub('', response)
+                clean_response = _TOOL_CALL_BRACKET_RE.sub('', clean_response)
                 
                 return {
                     "response": clean_response.strip(),
@@ -1775,8 +1782,8 @@ class ReportAgent:
         )
         
         # 清理响应
-        clean_response = re.sub(r'<tool_call>.*?</tool_call>', '', final_response, flags=re.DOTALL)
-        clean_response = re.sub(r'\[TOOL_CALL\].*?\)', '', clean_response)
+        clean_response = _TOOL_CALL_TAG_RE.sub('', final_response)
+        clean_response = _TOOL_CALL_BRACKET_RE.sub('', clean_response)
         
         return {
             "response": clean_response.strip(),
@@ -2102,8 +2109,6 @@ class ReportManager:
         Returns:
             清理后的内容
         """
-        import re
-        
         if not content:
             return content
         
@@ -2116,7 +2121,7 @@ class ReportManager:
             stripped = line.strip()
             
             # 检查是否是Markdown标题行
-            heading_match = re.match(r'^(#{1,6})\s+(.+)$', stripped)
+            heading_match = _MARKDOWN_HEADING_RE.match(stripped)
             
             if heading_match:
                 level = len(heading_match.group(1))
@@ -2278,8 +2283,6 @@ class ReportManager:
         Returns:
             处理后的内容
         """
-        import re
-        
         lines = content.split('\n')
         processed_lines = []
         prev_was_heading = False
@@ -2297,7 +2300,7 @@ class ReportManager:
             stripped = line.strip()
             
             # 检查是否是标题行
-            heading_match = re.match(r'^(#{1,6})\s+(.+)$', stripped)
+            heading_match = _MARKDOWN_HEADING_RE.match(stripped)
             
             if heading_match:
                 level = len(heading_match.group(1))
@@ -2307,7 +2310,7 @@ class ReportManager:
                 is_duplicate = False
                 for j in range(max(0, len(processed_lines) - 5), len(processed_lines)):
                     prev_line = processed_lines[j].strip()
-                    prev_match = re.match(r'^(#{1,6})\s+(.+)$', prev_line)
+                    prev_match = _MARKDOWN_HEADING_RE.match(prev_line)
                     if prev_match:
                         prev_title = prev_match.group(2).strip()
                         if prev_title == title:
@@ -2473,19 +2476,19 @@ class ReportManager:
         """根据模拟ID获取报告"""
         cls._ensure_reports_dir()
         
-        for item in os.listdir(cls.REPORTS_DIR):
-            item_path = os.path.join(cls.REPORTS_DIR, item)
-            # 新格式：文件夹
-            if os.path.isdir(item_path):
-                report = cls.get_report(item)
-                if report and report.simulation_id == simulation_id:
-                    return report
-            # 兼容旧格式：JSON文件
-            elif item.endswith('.json'):
-                report_id = item[:-5]
-                report = cls.get_report(report_id)
-                if report and report.simulation_id == simulation_id:
-                    return report
+        with os.scandir(cls.REPORTS_DIR) as entries:
+            for entry in entries:
+                # 新格式：文件夹
+                if entry.is_dir():
+                    report = cls.get_report(entry.name)
+                    if report and report.simulation_id == simulation_id:
+                        return report
+                # 兼容旧格式：JSON文件
+                elif entry.name.endswith('.json'):
+                    report_id = entry.name[:-5]
+                    report = cls.get_report(report_id)
+                    if report and report.simulation_id == simulation_id:
+                        return report
         
         return None
     
@@ -2495,21 +2498,21 @@ class ReportManager:
         cls._ensure_reports_dir()
         
         reports = []
-        for item in os.listdir(cls.REPORTS_DIR):
-            item_path = os.path.join(cls.REPORTS_DIR, item)
-            # 新格式：文件夹
-            if os.path.isdir(item_path):
-                report = cls.get_report(item)
-                if report:
-                    if simulation_id is None or report.simulation_id == simulation_id:
-                        reports.append(report)
-            # 兼容旧格式：JSON文件
-            elif item.endswith('.json'):
-                report_id = item[:-5]
-                report = cls.get_report(report_id)
-                if report:
-                    if simulation_id is None or report.simulation_id == simulation_id:
-                        reports.append(report)
+        with os.scandir(cls.REPORTS_DIR) as entries:
+            for entry in entries:
+                # 新格式：文件夹
+                if entry.is_dir():
+                    report = cls.get_report(entry.name)
+                    if report:
+                        if simulation_id is None or report.simulation_id == simulation_id:
+                            reports.append(report)
+                # 兼容旧格式：JSON文件
+                elif entry.name.endswith('.json'):
+                    report_id = entry.name[:-5]
+                    report = cls.get_report(report_id)
+                    if report:
+                        if simulation_id is None or report.simulation_id == simulation_id:
+                            reports.append(report)
         
         # 按创建时间倒序
         reports.sort(key=lambda r: r.created_at, reverse=True)
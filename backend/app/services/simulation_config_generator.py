@@ -10,16 +10,16 @@
 4. 生成平台配置
 """
 
+import re
 import json
 import math
 from typing import Dict, Any, List, Optional, Callable
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 
-from openai import OpenAI
-
 from ..config import Config
 from ..utils.logger import get_logger
+from ..utils.llm_client import get_openai_client
 from .zep_entity_reader import EntityNode, ZepEntityReader
 
 logger = get_logger('mirofish.simulation_config')
@@ -234,10 +234,7 @@ class SimulationConfigGenerator:
         if not self.api_key:
             raise ValueError("LLM_API_KEY 未配置")
         
-        self.client = OpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url
-        )
+        self.client = get_openai_client(self.api_key, self.base_url)
     
     def generate_config(
         self,
@@ -432,8 +429,6 @@ class SimulationConfigGenerator:
     
     def _call_llm_with_retry(self, prompt: str, system_prompt: str) -> Dict[str, Any]:
         """带重试的LLM调用，包含JSON修复逻辑"""
-        import re
-        
         max_attempts = 3
         last_error = None
         
@@ -499,8 +494,6 @@ class SimulationConfigGenerator:
     
     def _try_fix_config_json(self, content: str) -> Optional[Dict[str, Any]]:
         """尝试修复配置JSON"""
-        import re
-        
         # 修复被截断的情况
         content = self._fix_truncated_json(content)
         
@@ -12,7 +12,8 @@ import threading
 import subprocess
 import signal
 import atexit
-from typing import Dict, Any, List, Optional, Union
+from collections import Counter
+from typing import Dict, Any, Iterator, List, Optional, Union
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -226,6 +227,10 @@ class SimulationRunner:
     # 图谱记忆更新配置
     _graph_memory_enabled: Dict[str, bool] = {}  # simulation_id -> enabled
     
+    # 动作日志汇总结果缓存：(汇总类型, simulation_id) -> (日志文件签名, 查询参数, 结果)
+    # 每个模拟的每种汇总只保留最近一次结果，参数不同时直接覆盖
+    _aggregate_cache: Dict[tuple, tuple] = {}
+    
     @classmethod
     def get_run_state(cls, simulation_id: str) -> Optional[SimulationRunState]:
         """获取运行状态"""
@@ -817,16 +822,16 @@ class SimulationRunner:
         return state
     
     @classmethod
-    def _read_actions_from_file(
+    def _iter_actions_from_file(
         cls,
         file_path: str,
         default_platform: Optional[str] = None,
         platform_filter: Optional[str] = None,
         agent_id: Optional[int] = None,
         round_num: Optional[int] = None
-    ) -> List[AgentAction]:
+    ) -> Iterator[AgentAction]:
         """
-        从单个动作文件中读取动作
+        逐行流式读取单个动作文件中的动作（不在内存中累积整个文件）
         
         Args:
             file_path: 动作日志文件路径
@@ -836,9 +841,7 @@ class SimulationRunner:
             round_num: 过滤轮次
         """
         if not os.path.exists(file_path):
-            return []
-        
-        actions = []
+            return
         
         with open(file_path, 'r', encoding='utf-8') as f:
             for line in f:
@@ -848,98 +851,150 @@ class SimulationRunner:
                 
                 try:
                     data = json.loads(line)
-                    
-                    # 跳过非动作记录（如 simulation_start, round_start, round_end 等事件）
-                    if "event_type" in data:
-                        continue
-                    
-                    # 跳过没有 agent_id 的记录（非 Agent 动作）
-                    if "agent_id" not in data:
-                        continue
-                    
-                    # 获取平台：优先使用记录中的 platform，否则使用默认平台
-                    record_platform = data.get("platform") or default_platform or ""
-                    
-                    # 过滤
-                    if platform_filter and record_platform != platform_filter:
-                        continue
-                    if agent_id is not None and data.get("agent_id") != agent_id:
-                        continue
-                    if round_num is not None and data.get("round") != round_num:
-                        continue
-                    
-                    actions.append(AgentAction(
-                        round_num=data.get("round", 0),
-                        timestamp=data.get("timestamp", ""),
-                        platform=record_platform,
-                        agent_id=data.get("agent_id", 0),
-                        agent_name=data.get("agent_name", ""),
-                        action_type=data.get("action_type", ""),
-                        action_args=data.get("action_args", {}),
-                        result=data.get("result"),
-                        success=data.get("success", True),
-                    ))
-                    
                 except json.JSONDecodeError:
                     continue
+                
+                # 跳过非动作记录（如 simulation_start, round_start, round_end 等事件）
+                if "event_type" in data:
+                    continue
+                
+                # 跳过没有 agent_id 的记录（非 Agent 动作）
+                if "agent_id" not in data:
+                    continue
+                
+                # 获取平台：优先使用记录中的 platform，否则使用默认平台
+                record_platform = data.get("platform") or default_platform or ""
+                
+                # 过滤
+                if platform_filter and record_platform != platform_filter:
+                    continue
+                if agent_id is not None and data.get("agent_id") != agent_id:
+                    continue
+                if round_num is not None and data.get("round") != round_num:
+                    continue
+                
+                yield AgentAction(
+                    round_num=data.get("round", 0),
+                    timestamp=data.get("timestamp", ""),
+                    platform=record_platform,
+                    agent_id=data.get("agent_id", 0),
+                    agent_name=data.get("agent_name", ""),
+                    action_type=data.get("action_type", ""),
+                    action_args=data.get("action_args", {}),
+                    result=data.get("result"),
+                    success=data.get("success", True),
+                )
+    
+    @classmethod
+    def _read_actions_from_file(
+        cls,
+        file_path: str,
+        default_platform: Optional[str] = None,
+        platform_filter: Optional[str] = None,
+        agent_id: Optional[int] = None,
+        round_num: Optional[int] = None
+    ) -> List[AgentAction]:
+        """
+        从单个动作文件中读取动作
         
-        return actions
+        Args:
+            file_path: 动作日志文件路径
+            default_platform: 默认平台（当动作记录中没有 platform 字段时使用）
+            platform_filter: 过滤平台
+            agent_id: 过滤 Agent ID
+            round_num: 过滤轮次
+        """
+        return list(cls._iter_actions_from_file(
+            file_path,
+            default_platform=default_platform,
+            platform_filter=platform_filter,
+            agent_id=agent_id,
+            round_num=round_num
+        ))
     
     @classmethod
-    def get_all_actions(
+    def _iter_all_actions(
         cls,
         simulation_id: str,
         platform: Optional[str] = None,
         agent_id: Optional[int] = None,
         round_num: Optional[int] = None
-    ) -> List[AgentAction]:
+    ) -> Iterator[AgentAction]:
         """
-        获取所有平台的完整动作历史（无分页限制）
+        按文件顺序流式遍历所有平台的动作（不排序，适合单次遍历的汇总统计）
         
         Args:
             simulation_id: 模拟ID
             platform: 过滤平台（twitter/reddit）
             agent_id: 过滤Agent
             round_num: 过滤轮次
-            
-        Returns:
-            完整的动作列表（按时间戳排序，新的在前）
         """
         sim_dir = os.path.join(cls.RUN_STATE_DIR, simulation_id)
-        actions = []
+        found = False
         
         # 读取 Twitter 动作文件（根据文件路径自动设置 platform 为 twitter）
         twitter_actions_log = os.path.join(sim_dir, "twitter", "actions.jsonl")
         if not platform or platform == "twitter":
-            actions.extend(cls._read_actions_from_file(
+            for action in cls._iter_actions_from_file(
                 twitter_actions_log,
                 default_platform="twitter",  # 自动填充 platform 字段
                 platform_filter=platform,
-                agent_id=agent_id, 
+                agent_id=agent_id,
                 round_num=round_num
-            ))
+            ):
+                found = True
+                yield action
         
         # 读取 Reddit 动作文件（根据文件路径自动设置 platform 为 reddit）
         reddit_actions_log = os.path.join(sim_dir, "reddit", "actions.jsonl")
         if not platform or platform == "reddit":
-            actions.extend(cls._read_actions_from_file(
+            for action in cls._iter_actions_from_file(
                 reddit_actions_log,
                 default_platform="reddit",  # 自动填充 platform 字段
                 platform_filter=platform,
                 agent_id=agent_id,
                 round_num=round_num
-            ))
+            ):
+                found = True
+                yield action
         
         # 如果分平台文件不存在，尝试读取旧的单一文件格式
-        if not actions:
+        if not found:
             actions_log = os.path.join(sim_dir, "actions.jsonl")
-            actions = cls._read_actions_from_file(
+            yield from cls._iter_actions_from_file(
                 actions_log,
                 default_platform=None,  # 旧格式文件中应该有 platform 字段
                 platform_filter=platform,
                 agent_id=agent_id,
                 round_num=round_num
             )
+    
+    @classmethod
+    def get_all_actions(
+        cls,
+        simulation_id: str,
+        platform: Optional[str] = None,
+        agent_id: Optional[int] = None,
+        round_num: Optional[int] = None
+    ) -> List[AgentAction]:
+        """
+        获取所有平台的完整动作历史（无分页限制）
+        
+        Args:
+            simulation_id: 模拟ID
+            platform: 过滤平台（twitter/reddit）
+            agent_id: 过滤Agent
+            round_num: 过滤轮次
+            
+        Returns:
+            完整的动作列表（按时间戳排序，新的在前）
+        """
+        actions = list(cls._iter_all_actions(
+            simulation_id,
+            platform=platform,
+            agent_id=agent_id,
+            round_num=round_num
+        ))
         
         # 按时间戳排序（新的在前）
         actions.sort(key=lambda x: x.timestamp, reverse=True)
@@ -980,6 +1035,28 @@ class SimulationRunner:
         # 分页
         return actions[offset:offset + limit]
     
+    @classmethod
+    def _actions_log_signature(cls, simulation_id: str) -> tuple:
+        """
+        计算动作日志文件的签名（路径、修改时间、大小）
+        
+        日志未变化时签名不变，汇总接口可直接复用上次的结果，
+        轮询时只需 stat 文件而无需重新解析整个日志。
+        """
+        sim_dir = os.path.join(cls.RUN_STATE_DIR, simulation_id)
+        signature = []
+        for log_path in (
+            os.path.join(sim_dir, "twitter", "actions.jsonl"),
+            os.path.join(sim_dir, "reddit", "actions.jsonl"),
+            os.path.join(sim_dir, "actions.jsonl"),
+        ):
+            try:
+                st = os.stat(log_path)
+            except OSError:
+                continue
+            signature.append((log_path, st.st_mtime_ns, st.st_size))
+        return tuple(signature)
+    
     @classmethod
     def get_timeline(
         cls,
@@ -998,12 +1075,17 @@ class SimulationRunner:
         Returns:
             每轮的汇总信息
         """
-        actions = cls.get_actions(simulation_id, limit=10000)
-        
-        # 按轮次分组
+        cache_key = ("timeline", simulation_id)
+        params = (start_round, end_round)
+        signature = cls._actions_log_signature(simulation_id)
+        cached = cls._aggregate_cache.get(cache_key)
+        if cached and cached[0] == signature and cached[1] == params:
+            return cached[2]
+        
+        # 按轮次分组（单次流式遍历，不物化完整的动作列表）
         rounds: Dict[int, Dict[str, Any]] = {}
         
-        for action in actions:
+        for action in cls._iter_all_actions(simulation_id):
             round_num = action.round_num
             
             if round_num < start_round:
@@ -1017,7 +1099,7 @@ class SimulationRunner:
                     "twitter_actions": 0,
                     "reddit_actions": 0,
                     "active_agents": set(),
-                    "action_types": {},
+                    "action_types": Counter(),
                     "first_action_time": action.timestamp,
                     "last_action_time": action.timestamp,
                 }
@@ -1030,8 +1112,11 @@ class SimulationRunner:
                 r["reddit_actions"] += 1
             
             r["active_agents"].add(action.agent_id)
-            r["action_types"][action.action_type] = r["action_types"].get(action.action_type, 0) + 1
-            r["last_action_time"] = action.timestamp
+            r["action_types"][action.action_type] += 1
+            if action.timestamp < r["first_action_time"]:
+                r["first_action_time"] = action.timestamp
+            if action.timestamp > r["last_action_time"]:
+                r["last_action_time"] = action.timestamp
         
         # 转换为列表
         result = []
@@ -1044,11 +1129,12 @@ class SimulationRunner:
                 "total_actions": r["twitter_actions"] + r["reddit_actions"],
                 "active_agents_count": len(r["active_agents"]),
                 "active_agents": list(r["active_agents"]),
-                "action_types": r["action_types"],
+                "action_types": dict(r["action_types"]),
                 "first_action_time": r["first_action_time"],
                 "last_action_time": r["last_action_time"],
             })
         
+        cls._aggregate_cache[cache_key] = (signature, params, result)
         return result
     
     @classmethod
@@ -1059,11 +1145,16 @@ class SimulationRunner:
         Returns:
             Agent统计列表
         """
-        actions = cls.get_actions(simulation_id, limit=10000)
+        cache_key = ("agent_stats", simulation_id)
+        signature = cls._actions_log_signature(simulation_id)
+        cached = cls._aggregate_cache.get(cache_key)
+        if cached and cached[0] == signature:
+            return cached[2]
         
         agent_stats: Dict[int, Dict[str, Any]] = {}
         
-        for action in actions:
+        # 单次流式遍历，不物化完整的动作列表
+        for action in cls._iter_all_actions(simulation_id):
             agent_id = action.agent_id
             
             if agent_id not in agent_stats:
@@ -1073,7 +1164,7 @@ class SimulationRunner:
                     "total_actions": 0,
                     "twitter_actions": 0,
                     "reddit_actions": 0,
-                    "action_types": {},
+                    "action_types": Counter(),
                     "first_action_time": action.timestamp,
                     "last_action_time": action.timestamp,
                 }
@@ -1086,14 +1177,28 @@ class SimulationRunner:
             else:
                 stats["reddit_actions"] += 1
             
-            stats["action_types"][action.action_type] = stats["action_types"].get(action.action_type, 0) + 1
-            stats["last_action_time"] = action.timestamp
+            stats["action_types"][action.action_type] += 1
+            if action.timestamp < stats["first_action_time"]:
+                stats["first_action_time"] = action.timestamp
+            if action.timestamp > stats["last_action_time"]:
+                stats["last_action_time"] = action.timestamp
+        
+        for stats in agent_stats.values():
+            stats["action_types"] = dict(stats["action_types"])
         
         # 按总动作数排序
         result = sorted(agent_stats.values(), key=lambda x: x["total_actions"], reverse=True)
         
+        cls._aggregate_cache[cache_key] = (signature, None, result)
         return result
     
+    @classmethod
+    def _evict_aggregate_cache(cls, simulation_id: str):
+        """移除模拟的所有汇总缓存"""
+        # 先对键做快照，避免其他请求线程并发写入导致迭代时字典大小变化
+        for cache_key in [k for k in list(cls._aggregate_cache) if k[1] == simulation_id]:
+            cls._aggregate_cache.pop(cache_key, None)
+    
     @classmethod
     def cleanup_simulation_logs(cls, simulation_id: str) -> Dict[str, Any]:
         """
@@ -1121,6 +1226,9 @@ class SimulationRunner:
         
         sim_dir = os.path.join(cls.RUN_STATE_DIR, simulation_id)
         
+        # 动作日志即将删除，先移除基于它的汇总缓存
+        cls._evict_aggregate_cache(simulation_id)
+        
         if not os.path.exists(sim_dir):
             return {"success": True, "message": "模拟目录不存在，无需清理"}
         
@@ -1276,6 +1384,7 @@ class SimulationRunner:
         # 清理内存中的状态
         cls._processes.clear()
         cls._action_queues.clear()
+        cls._aggregate_cache.clear()
         
         logger.info("模拟进程清理完成")
     
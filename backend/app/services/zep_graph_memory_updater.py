@@ -5,22 +5,28 @@ Zep图谱记忆更新服务
 
 import os
 import time
+import hashlib
 import threading
 import json
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Tuple, Deque
 from dataclasses import dataclass
 from datetime import datetime
 from queue import Queue, Empty
+from collections import deque
 
 from zep_cloud.client import Zep
+from zep_cloud import EpisodeData
 
 from ..config import Config
 from ..utils.logger import get_logger
 
 logger = get_logger('mirofish.zep_graph_memory_updater')
 
+# 停止信号：放入活动队列以立即唤醒工作线程
+_SHUTDOWN = object()
 
-@dataclass
+
+@dataclass(slots=True)
 class AgentActivity:
     """Agent活动记录"""
     platform: str           # twitter / reddit
@@ -228,6 +234,22 @@ class ZepGraphMemoryUpdater:
     MAX_RETRIES = 3
     RETRY_DELAY = 2  # 秒
     
+    # 共享的 Zep 客户端：api_key 的 SHA-256 -> Zep 实例
+    # 多个模拟的更新器复用同一个 HTTP 连接池，避免每个更新器重新建立连接
+    _shared_clients: Dict[str, Zep] = {}
+    _clients_lock = threading.Lock()
+    
+    @classmethod
+    def _get_shared_client(cls, api_key: str) -> Zep:
+        """获取（或创建）按 api_key 共享的 Zep 客户端"""
+        cache_key = hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+        with cls._clients_lock:
+            client = cls._shared_clients.get(cache_key)
+            if client is None:
+                client = Zep(api_key=api_key)
+                cls._shared_clients[cache_key] = client
+            return client
+    
     def __init__(self, graph_id: str, api_key: Optional[str] = None):
         """
         初始化更新器
@@ -242,15 +264,16 @@ class ZepGraphMemoryUpdater:
         if not self.api_key:
             raise ValueError("ZEP_API_KEY未配置")
         
-        self.client = Zep(api_key=self.api_key)
+        self.client = self._get_shared_client(self.api_key)
         
         # 活动队列
         self._activity_queue: Queue = Queue()
         
         # 按平台分组的活动缓冲区（每个平台各自累积到BATCH_SIZE后批量发送）
-        self._platform_buffers: Dict[str, List[AgentActivity]] = {
-            'twitter': [],
-            'reddit': [],
+        # 使用 deque，从头部取出批次为 O(BATCH_SIZE)，无需复制剩余元素
+        self._platform_buffers: Dict[str, Deque[AgentActivity]] = {
+            'twitter': deque(),
+            'reddit': deque(),
         }
         self._buffer_lock = threading.Lock()
         
@@ -264,6 +287,7 @@ class ZepGraphMemoryUpdater:
         self._total_items_sent = 0  # 成功发送到Zep的活动条数
         self._failed_count = 0      # 发送失败的批次数
         self._skipped_count = 0     # 被过滤跳过的活动数（DO_NOTHING）
+        self._stats_lock = threading.Lock()  # 保护上述计数器（生产者线程与工作线程都会更新）
         
         logger.info(f"ZepGraphMemoryUpdater 初始化完成: graph_id={graph_id}, batch_size={self.BATCH_SIZE}")
     
@@ -289,12 +313,15 @@ class ZepGraphMemoryUpdater:
         """停止后台工作线程"""
         self._running = False
         
-        # 发送剩余的活动
-        self._flush_remaining()
+        # 放入停止信号，工作线程无需等待 get 超时即可退出
+        self._activity_queue.put(_SHUTDOWN)
         
         if self._worker_thread and self._worker_thread.is_alive():
             self._worker_thread.join(timeout=10)
         
+        # 发送剩余的活动；工作线程停止后不再取出新批次，即使 join 超时时它仍在发送最后一批，两者也不会重复发送同一批活动
+        self._flush_remaining()
+        
         logger.info(f"ZepGraphMemoryUpdater 已停止: graph_id={self.graph_id}, "
                    f"total_activities={self._total_activities}, "
                    f"batches_sent={self._total_sent}, "
@@ -325,11 +352,13 @@ class ZepGraphMemoryUpdater:
         """
         # 跳过DO_NOTHING类型的活动
         if activity.action_type == "DO_NOTHING":
-            self._skipped_count += 1
+            with self._stats_lock:
+                self._skipped_count += 1
             return
         
         self._activity_queue.put(activity)
-        self._total_activities += 1
+        with self._stats_lock:
+            self._total_activities += 1
         logger.debug(f"添加活动到Zep队列: {activity.agent_name} - {activity.action_type}")
     
     def add_activity_from_dict(self, data: Dict[str, Any], platform: str):
@@ -344,6 +373,12 @@ class ZepGraphMemoryUpdater:
         if "event_type" in data:
             return
         
+        # DO_NOTHING 在构造活动对象之前就过滤掉
+        if data.get("action_type") == "DO_NOTHING":
+            with self._stats_lock:
+                self._skipped_count += 1
+            return
+        
         activity = AgentActivity(
             platform=platform,
             agent_id=data.get("agent_id", 0),
@@ -351,34 +386,38 @@ class ZepGraphMemoryUpdater:
             action_type=data.get("action_type", ""),
             action_args=data.get("action_args", {}),
             round_num=data.get("round", 0),
-            timestamp=data.get("timestamp", datetime.now().isoformat()),
+            # 仅在缺少时间戳时才生成当前时间（dict.get 的默认值会被提前求值）
+            timestamp=data.get("timestamp") or datetime.now().isoformat(),
         )
         
         self.add_activity(activity)
     
     def _worker_loop(self):
         """后台工作循环 - 按平台批量发送活动到Zep"""
-        while self._running or not self._activity_queue.empty():
+        while self._running:
             try:
                 # 尝试从队列获取活动（超时1秒）
                 try:
                     activity = self._activity_queue.get(timeout=1)
+                    if activity is _SHUTDOWN:
+                        break
                     
-                    # 将活动添加到对应平台的缓冲区
-                    platform = activity.platform.lower()
+                    # 一次性取出队列中已积压的活动，只加一次锁添加到对应平台的缓冲区
+                    activities = self._drain_queue([activity])
                     with self._buffer_lock:
-                        if platform not in self._platform_buffers:
-                            self._platform_buffers[platform] = []
-                        self._platform_buffers[platform].append(activity)
-                        
-                        # 检查该平台是否达到批量大小
-                        if len(self._platform_buffers[platform]) >= self.BATCH_SIZE:
-                            batch = self._platform_buffers[platform][:self.BATCH_SIZE]
-                            self._platform_buffers[platform] = self._platform_buffers[platform][self.BATCH_SIZE:]
-                            # 释放锁后再发送
-                            self._send_batch_activities(batch, platform)
-                            # 发送间隔，避免请求过快
-                            time.sleep(self.SEND_INTERVAL)
+                        self._buffer_activities(activities)
+                        ready_batches = self._pop_ready_batches()
+                    
+                    # 释放锁后再发送：各平台已满的批次合并为一次请求，直到没有平台达到批量大小
+                    while ready_batches:
+                        self._send_batches(ready_batches)
+                        # 发送间隔，避免请求过快
+                        time.sleep(self.SEND_INTERVAL)
+                        # 已请求停止时不再取出新批次，剩余活动留在缓冲区由 stop() 统一发送
+                        if not self._running:
+                            break
+                        with self._buffer_lock:
+                            ready_batches = self._pop_ready_batches()
                     
                 except Empty:
                     pass
@@ -387,6 +426,92 @@ class ZepGraphMemoryUpdater:
                 logger.error(f"工作循环异常: {e}")
                 time.sleep(1)
     
+    def _drain_queue(self, activities: Optional[List[AgentActivity]] = None) -> List[AgentActivity]:
+        """
+        非阻塞地取出队列中当前所有的活动（丢弃停止信号）
+        
+        Args:
+            activities: 已取出的活动列表（新取出的活动追加在其后）
+        """
+        activities = activities if activities is not None else []
+        while True:
+            try:
+                activity = self._activity_queue.get_nowait()
+            except Empty:
+                return activities
+            if activity is not _SHUTDOWN:
+                activities.append(activity)
+    
+    def _buffer_activities(self, activities: List[AgentActivity]):
+        """将活动按平台添加到缓冲区（调用方需持有 _buffer_lock）"""
+        for activity in activities:
+            platform = activity.platform.lower()
+            if platform not in self._platform_buffers:
+                self._platform_buffers[platform] = deque()
+            self._platform_buffers[platform].append(activity)
+    
+    def _pop_ready_batches(self) -> List[Tuple[str, List[AgentActivity]]]:
+        """
+        从缓冲区取出各平台已满的批次（调用方需持有 _buffer_lock，发送需在释放锁后进行）
+        
+        每个平台每次最多取一批，保证同一平台的活动按顺序写入图谱
+        """
+        ready_batches = []
+        for platform, buffer in self._platform_buffers.items():
+            if len(buffer) >= self.BATCH_SIZE:
+                ready_batches.append((platform, [buffer.popleft() for _ in range(self.BATCH_SIZE)]))
+        return ready_batches
+    
+    def _send_batches(self, batches: List[Tuple[str, List[AgentActivity]]]):
+        """
+        发送多个平台的批次（每个批次合并为一个episode）
+        
+        只有一个批次时使用 graph.add；多个批次时通过一次 graph.add_batch 请求发送，
+        摊薄每次请求的网络往返开销
+        
+        Args:
+            batches: (平台名称, Agent活动列表) 列表
+        """
+        batches = [(platform, activities) for platform, activities in batches if activities]
+        if not batches:
+            return
+        if len(batches) == 1:
+            self._send_batch_activities(batches[0][1], batches[0][0])
+            return
+        
+        episodes = [
+            EpisodeData(
+                data="\n".join(activity.to_episode_text() for activity in activities),
+                type="text"
+            )
+            for _, activities in batches
+        ]
+        
+        # 带重试的发送
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                self.client.graph.add_batch(
+                    graph_id=self.graph_id,
+                    episodes=episodes
+                )
+                
+                with self._stats_lock:
+                    self._total_sent += len(batches)
+                    self._total_items_sent += sum(len(activities) for _, activities in batches)
+                for platform, activities in batches:
+                    display_name = self._get_platform_display_name(platform)
+                    logger.info(f"成功批量发送 {len(activities)} 条{display_name}活动到图谱 {self.graph_id}")
+                return
+                
+            except Exception as e:
+                if attempt < self.MAX_RETRIES - 1:
+                    logger.warning(f"合并批量发送到Zep失败 (尝试 {attempt + 1}/{self.MAX_RETRIES}): {e}")
+                    time.sleep(self.RETRY_DELAY * (attempt + 1))
+                else:
+                    logger.error(f"合并批量发送到Zep失败，已重试{self.MAX_RETRIES}次: {e}")
+                    with self._stats_lock:
+                        self._failed_count += len(batches)
+    
     def _send_batch_activities(self, activities: List[AgentActivity], platform: str):
         """
         批量发送活动到Zep图谱（合并为一条文本）
@@ -411,8 +536,9 @@ class ZepGraphMemoryUpdater:
                     data=combined_text
                 )
                 
-                self._total_sent += 1
-                self._total_items_sent += len(activities)
+                with self._stats_lock:
+                    self._total_sent += 1
+                    self._total_items_sent += len(activities)
                 display_name = self._get_platform_display_name(platform)
                 logger.info(f"成功批量发送 {len(activities)} 条{display_name}活动到图谱 {self.graph_id}")
                 logger.debug(f"批量内容预览: {combined_text[:200]}...")
@@ -424,32 +550,29 @@ class ZepGraphMemoryUpdater:
                     time.sleep(self.RETRY_DELAY * (attempt + 1))
                 else:
                     logger.error(f"批量发送到Zep失败，已重试{self.MAX_RETRIES}次: {e}")
-                    self._failed_count += 1
+                    with self._stats_lock:
+                        self._failed_count += 1
     
     def _flush_remaining(self):
         """发送队列和缓冲区中剩余的活动"""
         # 首先处理队列中剩余的活动，添加到缓冲区
-        while not self._activity_queue.empty():
-            try:
-                activity = self._activity_queue.get_nowait()
-                platform = activity.platform.lower()
-                with self._buffer_lock:
-                    if platform not in self._platform_buffers:
-                        self._platform_buffers[platform] = []
-                    self._platform_buffers[platform].append(activity)
-            except Empty:
-                break
+        activities = self._drain_queue()
         
-        # 然后发送各平台缓冲区中剩余的活动（即使不足BATCH_SIZE条）
+        # 然后发送各平台缓冲区中剩余的活动（即使不足BATCH_SIZE条），各平台合并为一次请求
+        # 持锁时只取出并清空缓冲区，发送在锁外进行
         with self._buffer_lock:
+            self._buffer_activities(activities)
+            remaining_batches = []
             for platform, buffer in self._platform_buffers.items():
                 if buffer:
-                    display_name = self._get_platform_display_name(platform)
-                    logger.info(f"发送{display_name}平台剩余的 {len(buffer)} 条活动")
-                    self._send_batch_activities(buffer, platform)
-            # 清空所有缓冲区
-            for platform in self._platform_buffers:
-                self._platform_buffers[platform] = []
+                    remaining_batches.append((platform, list(buffer)))
+                    # 清空缓冲区
+                    buffer.clear()
+        
+        for platform, buffer in remaining_batches:
+            display_name = self._get_platform_display_name(platform)
+            logger.info(f"发送{display_name}平台剩余的 {len(buffer)} 条活动")
+        self._send_batches(remaining_batches)
     
     def get_stats(self) -> Dict[str, Any]:
         """获取统计信息"""
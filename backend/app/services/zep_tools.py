@@ -8,9 +8,11 @@ Zep检索工具服务
 3. QuickSearch（简单搜索）- 快速检索
 """
 
+import re
 import time
 import json
-from typing import Dict, Any, List, Optional
+import concurrent.futures
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 
 from zep_cloud.client import Zep
@@ -22,6 +24,16 @@ from ..utils.llm_client import LLMClient
 logger = get_logger('mirofish.zep_tools')
 
 
+def _extract_keywords(query_lower: str) -> Tuple[str, ...]:
+    """
+    从（已小写的）查询中提取关键词（简单分词，去重并保持顺序）
+    
+    每次检索只计算一次，后续对每条文本打分时直接复用
+    """
+    words = query_lower.replace(',', ' ').replace('，', ' ').split()
+    return tuple(dict.fromkeys(w for w in words if len(w) > 1))
+
+
 @dataclass
 class SearchResult:
     """搜索结果"""
@@ -398,6 +410,9 @@ class ZepToolsService:
     MAX_RETRIES = 3
     RETRY_DELAY = 2.0
     
+    # InsightForge 并行检索（子问题搜索、节点详情）的最大线程数
+    MAX_SEARCH_WORKERS = 6
+    
     def __init__(self, api_key: Optional[str] = None, llm_client: Optional[LLMClient] = None):
         self.api_key = api_key or Config.ZEP_API_KEY
         if not self.api_key:
@@ -549,7 +564,7 @@ class ZepToolsService:
         
         # 提取查询关键词（简单分词）
         query_lower = query.lower()
-        keywords = [w.strip() for w in query_lower.replace(',', ' ').replace('，', ' ').split() if len(w.strip()) > 1]
+        keywords = _extract_keywords(query_lower)
         
         def match_score(text: str) -> int:
             """计算文本与查询的匹配分数"""
@@ -815,8 +830,9 @@ class ZepToolsService:
         # 尝试在所有节点中找到该实体
         all_nodes = self.get_all_nodes(graph_id)
         entity_node = None
+        entity_name_lower = entity_name.lower()
         for node in all_nodes:
-            if node.name.lower() == entity_name.lower():
+            if node.name.lower() == entity_name_lower:
                 entity_node = node
                 break
         
@@ -969,37 +985,37 @@ class ZepToolsService:
         result.sub_queries = sub_queries
         logger.info(f"生成 {len(sub_queries)} 个子问题")
         
-        # Step 2: 对每个子问题进行语义搜索
+        # Step 2: 对每个子问题进行语义搜索，并对原始问题也进行搜索
+        # 各次检索互不依赖，并行发出以重叠网络等待；结果仍按原顺序合并
+        search_requests = [(sub_query, 15) for sub_query in sub_queries]
+        search_requests.append((query, 20))
+        
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(len(search_requests), self.MAX_SEARCH_WORKERS)
+        ) as executor:
+            search_results = list(executor.map(
+                lambda req: self.search_graph(
+                    graph_id=graph_id,
+                    query=req[0],
+                    limit=req[1],
+                    scope="edges"
+                ),
+                search_requests
+            ))
+        
         all_facts = []
         all_edges = []
         seen_facts = set()
         
-        for sub_query in sub_queries:
-            search_result = self.search_graph(
-                graph_id=graph_id,
-                query=sub_query,
-                limit=15,
-                scope="edges"
-            )
-            
+        for i, search_result in enumerate(search_results):
             for fact in search_result.facts:
                 if fact not in seen_facts:
                     all_facts.append(fact)
                     seen_facts.add(fact)
             
-            all_edges.extend(search_result.edges)
-        
-        # 对原始问题也进行搜索
-        main_search = self.search_graph(
-            graph_id=graph_id,
-            query=query,
-            limit=20,
-            scope="edges"
-        )
-        for fact in main_search.facts:
-            if fact not in seen_facts:
-                all_facts.append(fact)
-                seen_facts.add(fact)
+            # 原始问题的搜索只补充事实，关系链仍只来自子问题
+            if i < len(sub_queries):
+                all_edges.extend(search_result.edges)
         
         result.semantic_facts = all_facts
         result.total_facts = len(all_facts)
@@ -1018,21 +1034,29 @@ class ZepToolsService:
         # 获取所有相关实体的详情（不限制数量，完整输出）
         entity_insights = []
         node_map = {}  # 用于后续关系链构建
-        
-        for uuid in list(entity_uuids):  # 处理所有实体，不截断
-            if not uuid:
-                continue
+        # 事实只小写一次，供每个实体的子串匹配复用
+        facts_lower = [(f, f.lower()) for f in all_facts]
+        
+        # 各节点详情的获取互不依赖，并行请求（处理所有实体，不截断）
+        entity_uuid_list = [uuid for uuid in entity_uuids if uuid]
+        node_details = []
+        if entity_uuid_list:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(len(entity_uuid_list), self.MAX_SEARCH_WORKERS)
+            ) as executor:
+                node_details = list(executor.map(self.get_node_detail, entity_uuid_list))
+        
+        for uuid, node in zip(entity_uuid_list, node_details):
             try:
-                # 单独获取每个相关节点的信息
-                node = self.get_node_detail(uuid)
                 if node:
                     node_map[uuid] = node
                     entity_type = next((l for l in node.labels if l not in ["Entity", "Node"]), "实体")
                     
                     # 获取该实体相关的所有事实（不截断）
+                    name_lower = node.name.lower()
                     related_facts = [
-                        f for f in all_facts 
-                        if node.name.lower() in f.lower()
+                        f for f, f_lower in facts_lower
+                        if name_lower in f_lower
                     ]
                     
                     entity_insights.append({
@@ -1043,7 +1067,7 @@ class ZepToolsService:
                         "related_facts": related_facts  # 完整输出，不截断
                     })
             except Exception as e:
-                logger.debug(f"获取节点 {uuid} 失败: {e}")
+                logger.debug(f"处理节点 {uuid} 失败: {e}")
                 continue
         
         result.entity_insights = entity_insights
@@ -1051,17 +1075,21 @@ class ZepToolsService:
         
         # Step 4: 构建所有关系链（不限制数量）
         relationship_chains = []
+        seen_chains = set()
         for edge_data in all_edges:  # 处理所有边，不截断
             if isinstance(edge_data, dict):
                 source_uuid = edge_data.get('source_node_uuid', '')
                 target_uuid = edge_data.get('target_node_uuid', '')
                 relation_name = edge_data.get('name', '')
                 
-                source_name = node_map.get(source_uuid, NodeInfo('', '', [], '', {})).name or source_uuid[:8]
-                target_name = node_map.get(target_uuid, NodeInfo('', '', [], '', {})).name or target_uuid[:8]
+                source_node = node_map.get(source_uuid)
+                target_node = node_map.get(target_uuid)
+                source_name = (source_node.name if source_node else '') or source_uuid[:8]
+                target_name = (target_node.name if target_node else '') or target_uuid[:8]
                 
                 chain = f"{source_name} --[{relation_name}]--> {target_name}"
-                if chain not in relationship_chains:
+                if chain not in seen_chains:
+                    seen_chains.add(chain)
                     relationship_chains.append(chain)
         
         result.relationship_chains = relationship_chains
@@ -1155,7 +1183,6 @@ class ZepToolsService:
         
         # 获取所有节点
         all_nodes = self.get_all_nodes(graph_id)
-        node_map = {n.uuid: n for n in all_nodes}
         result.all_nodes = all_nodes
         result.total_nodes = len(all_nodes)
         
@@ -1172,10 +1199,6 @@ class ZepToolsService:
             if not edge.fact:
                 continue
             
-            # 为事实添加实体名称
-            source_name = node_map.get(edge.source_node_uuid, NodeInfo('', '', [], '', {})).name or edge.source_node_uuid[:8]
-            target_name = node_map.get(edge.target_node_uuid, NodeInfo('', '', [], '', {})).name or edge.target_node_uuid[:8]
-            
             # 判断是否过期/失效
             is_historical = edge.is_expired or edge.is_invalid
             
@@ -1191,7 +1214,7 @@ class ZepToolsService:
         
         # 基于查询进行相关性排序
         query_lower = query.lower()
-        keywords = [w.strip() for w in query_lower.replace(',', ' ').replace('，', ' ').split() if len(w.strip()) > 1]
+        keywords = _extract_keywords(query_lower)
         
         def relevance_score(fact: str) -> int:
             fact_lower = fact.lower()
@@ -1394,7 +1417,6 @@ class ZepToolsService:
                     response_text = "[无回复]"
                 
                 # 提取关键引言（从两个平台的回答中）
-                import re
                 combined_responses = f"{twitter_response} {reddit_response}"
                 key_quotes = re.findall(r'[""「」『』]([^""「」『』]{10,100})[""「」『』]', combined_responses)
                 if not key_quotes:
@@ -1510,6 +1532,12 @@ class ZepToolsService:
             }
             agent_summaries.append(summary)
         
+        # 每个Agent一行紧凑JSON，Agent数量较多时可明显减少提示词token
+        agent_summaries_text = "\n".join(
+            json.dumps(summary, ensure_ascii=False, separators=(',', ':'))
+            for summary in agent_summaries
+        )
+        
         system_prompt = """你是一个专业的采访策划专家。你的任务是根据采访需求，从模拟Agent列表中选择最适合采访的对象。
 
 选择标准：
@@ -1531,7 +1559,7 @@ class ZepToolsService:
 {simulation_requirement if simulation_requirement else "未提供"}
 
 可选择的Agent列表（共{len(agent_summaries)}个）：
-{json.dumps(agent_summaries, ensure_ascii=False, indent=2)}
+{agent_summaries_text}
 
 请选择最多{max_agents}个最适合采访的Agent，并说明选择理由。"""
 
@@ -4,12 +4,46 @@ LLM客户端封装
 """
 
 import json
-from typing import Optional, Dict, Any, List
+import hashlib
+import threading
+from typing import Optional, Dict, Any, List, Tuple
 from openai import OpenAI
 
 from ..config import Config
 
 
+# OpenAI 客户端缓存：(base_url, api_key 的 SHA-256) -> OpenAI 实例
+# 同一组配置复用同一个 httpx 连接池，保持与模型服务的长连接
+_openai_clients: Dict[Tuple[str, str], OpenAI] = {}
+_openai_clients_lock = threading.Lock()
+
+
+def get_openai_client(api_key: str, base_url: str) -> OpenAI:
+    """
+    获取（或创建）共享的 OpenAI 客户端
+    
+    Args:
+        api_key: API Key
+        base_url: API 地址
+        
+    Returns:
+        按 (base_url, api_key) 缓存的 OpenAI 实例，请求超时与重试次数取自 Config
+    """
+    cache_key = (base_url, hashlib.sha256(api_key.encode('utf-8')).hexdigest())
+    client = _openai_clients.get(cache_key)
+    if client is None:
+        with _openai_clients_lock:
+            client = _openai_clients.get(cache_key)
+            if client is None:
+                kwargs = {"max_retries": Config.LLM_MAX_RETRIES}
+                # 仅在显式配置时覆盖超时，否则保留 SDK 默认值（长输出生成需要较长时间）
+                if Config.LLM_TIMEOUT is not None:
+                    kwargs["timeout"] = Config.LLM_TIMEOUT
+                client = OpenAI(api_key=api_key, base_url=base_url, **kwargs)
+                _openai_clients[cache_key] = client
+    return client
+
+
 class LLMClient:
     """LLM客户端"""
     
@@ -26,10 +60,7 @@ class LLMClient:
         if not self.api_key:
             raise ValueError("LLM_API_KEY 未配置")
         
-        self.client = OpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url
-        )
+        self.client = get_openai_client(self.api_key, self.base_url)
     
     def chat(
         self,